@@ -20,9 +20,21 @@ from ..utils import (
 
 
 class ArteTVBaseIE(InfoExtractor):
-    _ARTE_LANGUAGES = 'fr|de|en|es|it|pl'
+    _ARTE_LANGUAGE_TUPLE = ('fr', 'de', 'en', 'es', 'it', 'pl')
+    _ARTE_LANGUAGES = '|'.join(_ARTE_LANGUAGE_TUPLE)
     _API_BASE = 'https://api.arte.tv/api/player/v1'
 
+    def __init__(self, *args, **kwargs):
+        super(ArteTVBaseIE, self).__init__(*args, **kwargs)
+        self._api_config_cache = {}
+
+    def _download_api_config(self, lang, video_id):
+        key = (lang, video_id)
+        if key not in self._api_config_cache:
+            self._api_config_cache[key] = self._download_json(
+                '%s/config/%s/%s' % (self._API_BASE, lang, video_id), video_id)
+        return self._api_config_cache[key]
+
 
 class ArteTVIE(ArteTVBaseIE):
     _VALID_URL = r'''(?x)
@@ -33,6 +45,16 @@ class ArteTVIE(ArteTVBaseIE):
                         )
                         /(?P<id>\d{6}-\d{3}-[AF])
                     ''' % {'langs': ArteTVBaseIE._ARTE_LANGUAGES}
+    _VALID_URL_RE = re.compile(_VALID_URL, re.VERBOSE)
+    _LANGS = {
+        'fr': 'F',
+        'de': 'A',
+        'en': 'E[ANG]',
+        'es': 'E[ESP]',
+        'it': 'E[ITA]',
+        'pl': 'E[POL]',
+    }
+    _QFUNC = staticmethod(qualities(['MQ', 'HQ', 'EQ', 'SQ']))
     _TESTS = [{
         'url': 'https://www.arte.tv/en/videos/088501-000-A/mexico-stealing-petrol-to-survive/',
         'info_dict': {
@@ -50,12 +72,11 @@ class ArteTVIE(ArteTVBaseIE):
     }]
 
     def _real_extract(self, url):
-        mobj = re.match(self._VALID_URL, url)
+        mobj = self._VALID_URL_RE.match(url)
         video_id = mobj.group('id')
         lang = mobj.group('lang') or mobj.group('lang_2')
 
-        info = self._download_json(
-            '%s/config/%s/%s' % (self._API_BASE, lang, video_id), video_id)
+        info = self._download_api_config(lang, video_id)
         player_info = info['videoJsonPlayer']
 
         vsr = try_get(player_info, lambda x: x['VSR'], dict)
@@ -70,25 +91,47 @@ class ArteTVIE(ArteTVBaseIE):
 
         upload_date_str = player_info.get('shootingDate')
         if not upload_date_str:
-            upload_date_str = (player_info.get('VRA') or player_info.get('VDA') or '').split(' ')[0]
+            upload_date_str = (player_info.get('VRA') or player_info.get('VDA') or '').partition(' ')[0]
 
         title = (player_info.get('VTI') or player_info['VID']).strip()
         subtitle = player_info.get('VSU', '').strip()
         if subtitle:
             title += ' - %s' % subtitle
 
-        qfunc = qualities(['MQ', 'HQ', 'EQ', 'SQ'])
-
-        LANGS = {
-            'fr': 'F',
-            'de': 'A',
-            'en': 'E[ANG]',
-            'es': 'E[ESP]',
-            'it': 'E[ITA]',
-            'pl': 'E[POL]',
-        }
-
-        langcode = LANGS.get(lang, lang)
+        langcode = self._LANGS.get(lang, lang)
+        l = re.escape(langcode)
+
+        # Language preference from most to least priority
+        # Reference: section 6.8 of
+        # https://www.arte.tv/sites/en/corporate/files/complete-technical-guidelines-arte-geie-v1-07-1.pdf
+        PREFERENCES = (
+            # original version in requested language, without subtitles
+            r'VO{0}$'.format(l),
+            # original version in requested language, with partial subtitles in requested language
+            r'VO{0}-ST{0}$'.format(l),
+            # original version in requested language, with subtitles for the deaf and hard-of-hearing in requested language
+            r'VO{0}-STM{0}$'.format(l),
+            # non-original (dubbed) version in requested language, without subtitles
+            r'V{0}$'.format(l),
+            # non-original (dubbed) version in requested language, with subtitles partial subtitles in requested language
+            r'V{0}-ST{0}$'.format(l),
+            # non-original (dubbed) version in requested language, with subtitles for the deaf and hard-of-hearing in requested language
+            r'V{0}-STM{0}$'.format(l),
+            # original version in requested language, with partial subtitles in different language
+            r'VO{0}-ST(?!{0}).+?$'.format(l),
+            # original version in requested language, with subtitles for the deaf and hard-of-hearing in different language
+            r'VO{0}-STM(?!{0}).+?$'.format(l),
+            # original version in different language, with partial subtitles in requested language
+            r'VO(?:(?!{0}).+?)?-ST{0}$'.format(l),
+            # original version in different language, with subtitles for the deaf and hard-of-hearing in requested language
+            r'VO(?:(?!{0}).+?)?-STM{0}$'.format(l),
+            # original version in different language, without subtitles
+            r'VO(?:(?!{0}))?$'.format(l),
+            # original version in different language, with partial subtitles in different language
+            r'VO(?:(?!{0}).+?)?-ST(?!{0}).+?$'.format(l),
+            # original version in different language, with subtitles for the deaf and hard-of-hearing in different language
+            r'VO(?:(?!{0}).+?)?-STM(?!{0}).+?$'.format(l),
+        )
 
         formats = []
         for format_id, format_dict in vsr.items():
@@ -98,40 +141,6 @@ class ArteTVIE(ArteTVBaseIE):
             if not format_url and not streamer:
                 continue
             versionCode = f.get('versionCode')
-            l = re.escape(langcode)
-
-            # Language preference from most to least priority
-            # Reference: section 6.8 of
-            # https://www.arte.tv/sites/en/corporate/files/complete-technical-guidelines-arte-geie-v1-07-1.pdf
-            PREFERENCES = (
-                # original version in requested language, without subtitles
-                r'VO{0}$'.format(l),
-                # original version in requested language, with partial subtitles in requested language
-                r'VO{0}-ST{0}$'.format(l),
-                # original version in requested language, with subtitles for the deaf and hard-of-hearing in requested language
-                r'VO{0}-STM{0}$'.format(l),
-                # non-original (dubbed) version in requested language, without subtitles
-                r'V{0}$'.format(l),
-                # non-original (dubbed) version in requested language, with subtitles partial subtitles in requested language
-                r'V{0}-ST{0}$'.format(l),
-                # non-original (dubbed) version in requested language, with subtitles for the deaf and hard-of-hearing in requested language
-                r'V{0}-STM{0}$'.format(l),
-                # original version in requested language, with partial subtitles in different language
-                r'VO{0}-ST(?!{0}).+?$'.format(l),
-                # original version in requested language, with subtitles for the deaf and hard-of-hearing in different language
-                r'VO{0}-STM(?!{0}).+?$'.format(l),
-                # original version in different language, with partial subtitles in requested language
-                r'VO(?:(?!{0}).+?)?-ST{0}$'.format(l),
-                # original version in different language, with subtitles for the deaf and hard-of-hearing in requested language
-                r'VO(?:(?!{0}).+?)?-STM{0}$'.format(l),
-                # original version in different language, without subtitles
-                r'VO(?:(?!{0}))?$'.format(l),
-                # original version in different language, with partial subtitles in different language
-                r'VO(?:(?!{0}).+?)?-ST(?!{0}).+?$'.format(l),
-                # original version in different language, with subtitles for the deaf and hard-of-hearing in different language
-                r'VO(?:(?!{0}).+?)?-STM(?!{0}).+?$'.format(l),
-            )
-
             for pref, p in enumerate(PREFERENCES):
                 if re.match(p, versionCode):
                     lang_pref = len(PREFERENCES) - pref
@@ -157,7 +166,7 @@ class ArteTVIE(ArteTVBaseIE):
                 'width': int_or_none(f.get('width')),
                 'height': int_or_none(f.get('height')),
                 'tbr': int_or_none(f.get('bitrate')),
-                'quality': qfunc(f.get('quality')),
+                'quality': self._QFUNC(f.get('quality')),
             }
 
             if media_type == 'rtmp':
@@ -169,20 +178,32 @@ class ArteTVIE(ArteTVBaseIE):
 
             formats.append(format)
 
+        if not formats:
+            raise ExtractorError('No streams available', expected=True)
         self._sort_formats(formats)
 
+        thumbnail = player_info.get('programImage')
+        if not thumbnail:
+            vtu = player_info.get('VTU')
+            thumbnail = vtu.get('IUR') if isinstance(vtu, dict) else None
+
         return {
             'id': player_info.get('VID') or video_id,
             'title': title,
             'description': player_info.get('VDE'),
             'upload_date': unified_strdate(upload_date_str),
-            'thumbnail': player_info.get('programImage') or player_info.get('VTU', {}).get('IUR'),
+            'thumbnail': thumbnail,
             'formats': formats,
         }
 
 
 class ArteTVEmbedIE(InfoExtractor):
     _VALID_URL = r'https?://(?:www\.)?arte\.tv/player/v\d+/index\.php\?.*?\bjson_url=.+'
+    _VALID_URL_RE = re.compile(_VALID_URL)
+    _EMBED_RE = re.compile(
+        r'<(?:iframe|script)[^>]+?\bsrc\s*=\s*(?P<q>["\'])(?P<url>(?:https?:)?//(?:www\.)?arte\.tv/player/v\d+/index\.php\?[^"\'<>\s]*?\bjson_url=[^"\'<>\s]+)(?P=q)')
+    _JSON_URL_RE = re.compile(
+        r'/config/(?P<lang>%s)/(?P<id>\d{6}-\d{3}-[AF])' % ArteTVBaseIE._ARTE_LANGUAGES)
     _TESTS = [{
         'url': 'https://www.arte.tv/player/v5/index.php?json_url=https%3A%2F%2Fapi.arte.tv%2Fapi%2Fplayer%2Fv2%2Fconfig%2Fde%2F100605-013-A&lang=de&autoplay=true&mute=0100605-013-A',
         'info_dict': {
@@ -199,20 +220,25 @@ class ArteTVEmbedIE(InfoExtractor):
 
     @staticmethod
     def _extract_urls(webpage):
-        return [url for _, url in re.findall(
-            r'<(?:iframe|script)[^>]+src=(["\'])(?P<url>(?:https?:)?//(?:www\.)?arte\.tv/player/v\d+/index\.php\?.*?\bjson_url=.+?)\1',
-            webpage)]
+        return [m.group('url') for m in ArteTVEmbedIE._EMBED_RE.finditer(webpage)]
 
     def _real_extract(self, url):
-        qs = compat_urlparse.parse_qs(compat_urlparse.urlparse(url).query)
-        json_url = qs['json_url'][0]
-        video_id = ArteTVIE._match_id(json_url)
+        json_url = compat_urlparse.parse_qs(
+            url.partition('?')[2]).get('json_url', [None])[0]
+        if not json_url:
+            raise ExtractorError('Missing json_url')
+        mobj = self._JSON_URL_RE.search(json_url)
+        if not mobj:
+            return self.url_result(json_url)
+        lang, video_id = mobj.group('lang', 'id')
         return self.url_result(
-            json_url, ie=ArteTVIE.ie_key(), video_id=video_id)
+            'https://www.arte.tv/%s/videos/%s/' % (lang, video_id),
+            ie=ArteTVIE.ie_key(), video_id=video_id)
 
 
 class ArteTVPlaylistIE(ArteTVBaseIE):
     _VALID_URL = r'https?://(?:www\.)?arte\.tv/(?P<lang>%s)/videos/(?P<id>RC-\d{6})' % ArteTVBaseIE._ARTE_LANGUAGES
+    _VALID_URL_RE = re.compile(_VALID_URL)
     _TESTS = [{
         'url': 'https://www.arte.tv/en/videos/RC-016954/earn-a-living/',
         'info_dict': {
@@ -227,28 +253,30 @@ class ArteTVPlaylistIE(ArteTVBaseIE):
     }]
 
     def _real_extract(self, url):
-        lang, playlist_id = re.match(self._VALID_URL, url).groups()
+        lang, playlist_id = self._VALID_URL_RE.match(url).groups()
         collection = self._download_json(
             '%s/collectionData/%s/%s?source=videos'
             % (self._API_BASE, lang, playlist_id), playlist_id)
+        ie_key = ArteTVIE.ie_key()
         entries = []
-        for video in collection['videos']:
+        for video in collection.get('videos') or []:
             if not isinstance(video, dict):
                 continue
             video_url = url_or_none(video.get('url')) or url_or_none(video.get('jsonUrl'))
             if not video_url:
                 continue
-            video_id = video.get('programId')
+            main_image = video.get('mainImage')
+            thumbnail = url_or_none(main_image.get('url')) if isinstance(main_image, dict) else None
             entries.append({
                 '_type': 'url_transparent',
                 'url': video_url,
-                'id': video_id,
+                'id': video.get('programId'),
                 'title': video.get('title'),
                 'alt_title': video.get('subtitle'),
-                'thumbnail': url_or_none(try_get(video, lambda x: x['mainImage']['url'], compat_str)),
+                'thumbnail': thumbnail,
                 'duration': int_or_none(video.get('durationSeconds')),
                 'view_count': int_or_none(video.get('views')),
-                'ie_key': ArteTVIE.ie_key(),
+                'ie_key': ie_key,
             })
         title = collection.get('title')
         description = collection.get('shortDescription') or collection.get('teaserText')
@@ -257,6 +285,15 @@ class ArteTVPlaylistIE(ArteTVBaseIE):
 
 class ArteTVCategoryIE(ArteTVBaseIE):
     _VALID_URL = r'https?://(?:www\.)?arte\.tv/(?P<lang>%s)/videos/(?P<id>[\w-]+(?:/[\w-]+)*)/?\s*$' % ArteTVBaseIE._ARTE_LANGUAGES
+    _VALID_URL_RE = re.compile(_VALID_URL)
+    _ITEM_RES = dict(
+        (lang, re.compile(r'<a\b[^>]*href\s*=\s*(?P<q>"|\')(?P<url>https?://www\.arte\.tv/%s/videos/[\w/-]+)(?P=q)' % lang))
+        for lang in ArteTVBaseIE._ARTE_LANGUAGE_TUPLE)
+    # Matches what ArteTVIE or ArteTVPlaylistIE would accept; their own
+    # patterns cannot be joined directly as they share group names
+    _CHILD_RE = re.compile(
+        r'https?://(?:www\.)?arte\.tv/(?:%s)/videos/(?:\d{6}-\d{3}-[AF]|RC-\d{6})'
+        % ArteTVBaseIE._ARTE_LANGUAGES)
     _TESTS = [{
         'url': 'https://www.arte.tv/en/videos/politics-and-society/',
         'info_dict': {
@@ -270,28 +307,32 @@ class ArteTVCategoryIE(ArteTVBaseIE):
 
     @classmethod
     def suitable(cls, url):
+        if 'arte.tv' not in url:
+            return False
         return (
-            not any(ie.suitable(url) for ie in (ArteTVIE, ArteTVPlaylistIE, ))
+            not cls._CHILD_RE.match(url)
             and super(ArteTVCategoryIE, cls).suitable(url))
 
     def _real_extract(self, url):
-        lang, playlist_id = re.match(self._VALID_URL, url).groups()
+        lang, playlist_id = self._VALID_URL_RE.match(url).groups()
         webpage = self._download_webpage(url, playlist_id)
+        if ('/%s/videos/' % lang) not in webpage:
+            return
 
         items = []
-        for video in re.finditer(
-                r'<a\b[^>]*?href\s*=\s*(?P<q>"|\'|\b)(?P<url>https?://www\.arte\.tv/%s/videos/[\w/-]+)(?P=q)' % lang,
-                webpage):
+        seen = set()
+        for video in self._ITEM_RES[lang].finditer(webpage):
             video = video.group('url')
-            if video == url:
+            if video in seen or video == url:
                 continue
-            if any(ie.suitable(video) for ie in (ArteTVIE, ArteTVPlaylistIE, )):
+            seen.add(video)
+            if self._CHILD_RE.match(video):
                 items.append(video)
 
         if items:
             title = (self._og_search_title(webpage, default=None)
                      or self._html_search_regex(r'<title\b[^>]*>([^<]+)</title>', default=None))
-            title = strip_or_none(title.rsplit('|', 1)[0]) or self._generic_title(url)
+            title = strip_or_none(title.rpartition('|')[0] or title) or self._generic_title(url)
 
             result = self.playlist_from_matches(items, playlist_id=playlist_id, playlist_title=title)
             if result: